@@ -1,9 +1,57 @@
 """
 Article fetcher - handles Substack and general web URLs
 """
+import hashlib
+import json
+import time
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import NavigableString, Tag
 from urllib.parse import urlparse
+from pathlib import Path
+
+# Prefer the C-based lxml parser (much faster than html.parser),
+# but fall back gracefully if it isn't installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Shared client so repeat requests to the same host reuse the TCP/TLS
+# connection instead of paying a fresh handshake per URL. With httpx (and
+# h2) installed we also get HTTP/2, which multiplexes the many Substack
+# fetches from the thread pool over a single connection; the client's
+# .get()/.content/.encoding interface matches requests, so the fetchers
+# don't care which one they got.
+try:
+    import httpx
+    import h2  # noqa: F401 - without it httpx would only fail at request time
+    # http2/limits must go on the transport - a custom transport ignores
+    # the Client-level kwargs
+    _SESSION = httpx.Client(
+        follow_redirects=True,
+        headers={'User-Agent': _USER_AGENT},
+        transport=httpx.HTTPTransport(
+            retries=3,
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        ),
+    )
+except ImportError:
+    _SESSION = requests.Session()
+    _adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    _SESSION.mount('http://', _adapter)
+    _SESSION.mount('https://', _adapter)
+    _SESSION.headers.update({'User-Agent': _USER_AGENT})
 
 
 def is_substack_url(url):
@@ -11,17 +59,50 @@ def is_substack_url(url):
     return 'substack.com' in url
 
 
+# Strainers so the parser only builds the nodes we actually read, instead
+# of the full Substack page (nav, sidebars, comments, recommendations)
+_SUBSTACK_META_STRAINER = SoupStrainer(['h1', 'title', 'time', 'link'])
+_SUBSTACK_AUTHOR_STRAINER = SoupStrainer(
+    'a', href=lambda h: h and h.startswith('https://substack.com/@'))
+# class_ must be a callable: a plain list only matches single-class divs
+_SUBSTACK_CONTENT_STRAINER = SoupStrainer(
+    'div', class_=lambda c: c is not None and
+    ('available-content' in c.split() or 'body' in c.split()))
+
+
+def _strip_tags(content_div, tags):
+    """
+    Drop unwanted elements from a content container and return its HTML.
+    With lxml available this runs etree.strip_elements - a single C pass -
+    instead of a Python-level decompose() walk per matching tag.
+    """
+    if HTML_PARSER == 'lxml':
+        from lxml import etree
+        from lxml import html as lxml_html
+        root = lxml_html.fromstring(str(content_div))
+        # with_tail=False keeps text that follows a removed element,
+        # matching what decompose() does on a bs4 tree
+        etree.strip_elements(root, *tags, with_tail=False)
+        return lxml_html.tostring(root, encoding='unicode')
+    for tag in content_div.find_all(list(tags)):
+        tag.decompose()
+    return str(content_div)
+
+
 def fetch_substack_article(url):
     """
     Fetch a Substack article using web scraping.
     Handles both direct URLs and reader view URLs.
     """
-    response = requests.get(url, headers={
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    response = _SESSION.get(url, timeout=10)
     response.raise_for_status()
-    
-    soup = BeautifulSoup(response.text, 'html.parser')
+
+    # Hand raw bytes to the parser - lxml sniffs the charset in C, so we
+    # skip materializing a second full-page copy as a Python str
+    page = response.content
+    # Metadata lives in a handful of tags - no need to build the whole tree
+    soup = BeautifulSoup(page, HTML_PARSER, parse_only=_SUBSTACK_META_STRAINER,
+                         from_encoding=response.encoding)
 
     # If this is a reader view URL, find the canonical article URL and re-fetch
     if '/home/post/' in url:
@@ -47,7 +128,8 @@ def fetch_substack_article(url):
     publication = None
 
     # Publication name - h1 title with link to home
-    pub_heading = soup.find('h1', class_=lambda c: c and 'title' in c)
+    # (compiled CSS selector - no per-node Python lambda dispatch)
+    pub_heading = soup.select_one('h1[class*=title]')
     if pub_heading:
         pub_link = pub_heading.find('a', href='/')
         if pub_link:
@@ -59,11 +141,13 @@ def fetch_substack_article(url):
                     publication = img.get('alt')
 
     # Author name - link to @username profile with non-empty text
-    author_links = soup.find_all('a', href=lambda h: h and h.startswith('https://substack.com/@'))
+    author_soup = BeautifulSoup(page, HTML_PARSER, parse_only=_SUBSTACK_AUTHOR_STRAINER,
+                                from_encoding=response.encoding)
+    author_links = author_soup.find_all('a')
     for link in author_links:
-        text = link.get_text(strip=True)
-        if text:
-            author = text
+        link_text = link.get_text(strip=True)
+        if link_text:
+            author = link_text
             break
 
     # Format author string
@@ -86,21 +170,20 @@ def fetch_substack_article(url):
     content_html = ""
     
     # Try to find main content container
-    content_div = soup.find('div', class_='available-content')
+    content_soup = BeautifulSoup(page, HTML_PARSER, parse_only=_SUBSTACK_CONTENT_STRAINER,
+                                 from_encoding=response.encoding)
+    content_div = content_soup.find('div', class_='available-content')
     if not content_div:
-        content_div = soup.find('div', class_='body')
+        content_div = content_soup.find('div', class_='body')
     if not content_div:
-        # Fallback: find article tag
-        content_div = soup.find('article')
+        # Fallback: find article tag (rare - only now parse the full page)
+        content_div = BeautifulSoup(page, HTML_PARSER,
+                                    from_encoding=response.encoding).find('article')
     
     if content_div:
-        # Remove unwanted elements
-        for tag in content_div.find_all(['script', 'style', 'button', 'form']):
-            tag.decompose()
-        
-        # Get HTML content
-        content_html = str(content_div)
-    
+        # Remove unwanted elements and serialize
+        content_html = _strip_tags(content_div, ('script', 'style', 'button', 'form'))
+
     return {
         'title': title or 'Untitled',
         'author': author or 'Unknown Author',
@@ -117,28 +200,27 @@ def fetch_aeon_article(url):
     """
     Fetch an Aeon article using web scraping.
     """
-    response = requests.get(url, headers={
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }, timeout=10)
+    response = _SESSION.get(url, timeout=10)
     response.raise_for_status()
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.content, HTML_PARSER,
+                         from_encoding=response.encoding)
     
     # Extract title - it's in an h2 with specific classes
     title = None
-    title_tag = soup.find('h2', class_=lambda c: c and 'font-serif' in c)
+    title_tag = soup.select_one('h2[class*=font-serif]')
     if title_tag:
         title = title_tag.get_text(strip=True)
-    
+
     # Extract author - in aside section
     author = None
-    author_link = soup.find('a', href=lambda h: h and h.startswith('/users/'))
+    author_link = soup.select_one('a[href^="/users/"]')
     if author_link:
         author = author_link.get_text(strip=True)
-    
+
     # Extract date - in a p tag with specific format
     date = None
-    date_tag = soup.find('div', class_=lambda c: c and 'font-mono' in c and 'text-grey-mid-light' in c)
+    date_tag = soup.select_one('div[class*=font-mono][class*=text-grey-mid-light]')
     if date_tag:
         date = date_tag.get_text(strip=True)
     
@@ -147,15 +229,12 @@ def fetch_aeon_article(url):
     content_div = soup.find('div', id='article-content')
     
     if content_div:
-        # Remove unwanted elements
-        for tag in content_div.find_all(['script', 'style', 'button', 'form']):
-            tag.decompose()
-        
         # Remove newsletter signup
         for tag in content_div.find_all('div', class_='NLFormInsertFromCMS'):
             tag.decompose()
-        
-        content_html = str(content_div)
+
+        # Remove unwanted elements and serialize
+        content_html = _strip_tags(content_div, ('script', 'style', 'button', 'form'))
     
     return {
         'title': title or 'Untitled',
@@ -166,17 +245,44 @@ def fetch_aeon_article(url):
     }
 
 
+def _longest_text_div(soup):
+    """
+    Find the div containing the most text, visiting each node once.
+    Calling div.get_text() per candidate re-walks nested divs' subtrees,
+    so text lengths are accumulated bottom-up instead.
+    """
+    best_div = None
+    best_len = 0
+
+    def walk(node):
+        nonlocal best_div, best_len
+        total = 0
+        for child in node.children:
+            if isinstance(child, NavigableString):
+                total += len(child)
+            elif isinstance(child, Tag):
+                total += walk(child)
+        # >= so an outer wrapper div beats an equally long inner one,
+        # matching what a first-match scan over get_text() would pick
+        if node.name == 'div' and total > 0 and total >= best_len:
+            best_div = node
+            best_len = total
+        return total
+
+    walk(soup)
+    return best_div
+
+
 def fetch_general_article(url):
     """
     Fetch a general web article using BeautifulSoup.
     This is a simple extraction - works for basic articles but not all sites.
     """
-    response = requests.get(url, headers={
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }, timeout=10)
+    response = _SESSION.get(url, timeout=10)
     response.raise_for_status()
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.content, HTML_PARSER,
+                         from_encoding=response.encoding)
     
     # Extract title
     title = None
@@ -202,37 +308,22 @@ def fetch_general_article(url):
         date = time_tag.get('datetime') or time_tag.get_text(strip=True)
     
     # Extract main content
-    # Try common article containers
-    content_div = None
-    for selector in [
-        ('div', {'id': 'body'}),
-        ('div', {'class': 'entry-content'}),
-        ('article', {}),
-        ('div', {'class': 'article'}),
-        ('div', {'class': 'content'}),
-        ('div', {'class': 'post'}),
-        ('main', {}),
-    ]:
-        content_div = soup.find(selector[0], selector[1])
-        if content_div:
-            break
+    # Try common article containers - one compiled selector traverses the
+    # tree once instead of a full find() walk per candidate; the first
+    # matching container in document order wins
+    content_div = soup.select_one(
+        'div#body, div.entry-content, article, div.article, '
+        'div.content, div.post, main')
     
     # Fallback: try to find the longest div with paragraphs
     if not content_div:
-        all_divs = soup.find_all('div')
-        max_text_len = 0
-        for div in all_divs:
-            text_len = len(div.get_text())
-            if text_len > max_text_len:
-                max_text_len = text_len
-                content_div = div
+        content_div = _longest_text_div(soup)
     
     content_html = ""
     if content_div:
-        # Remove unwanted elements
-        for tag in content_div.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-            tag.decompose()
-        content_html = str(content_div)
+        # Remove unwanted elements and serialize
+        content_html = _strip_tags(
+            content_div, ('script', 'style', 'nav', 'header', 'footer', 'aside'))
     
     return {
         'title': title or 'Untitled',
@@ -243,14 +334,41 @@ def fetch_general_article(url):
     }
 
 
+# Fetched articles are cached on disk so re-running on the same URL list
+# (e.g. while iterating with --debug) only hits the network for new URLs
+_CACHE_DIR = Path('Newspapers') / '.cache'
+_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+
+def _cache_path(url):
+    # BLAKE2b is the fastest hash in the stdlib for short inputs
+    key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    return _CACHE_DIR / f'{key}.json'
+
+
 def fetch_article(url):
     """
     Fetch an article from any URL.
     Automatically detects Substack vs Aeon vs general web articles.
+    Results are cached in Newspapers/.cache for 24 hours.
     """
+    cache_file = _cache_path(url)
+    try:
+        if time.time() - cache_file.stat().st_mtime < _CACHE_MAX_AGE:
+            with open(cache_file) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass  # missing, expired or unreadable cache entry - fetch fresh
+
     if is_substack_url(url):
-        return fetch_substack_article(url)
+        article = fetch_substack_article(url)
     elif is_aeon_url(url):
-        return fetch_aeon_article(url)
+        article = fetch_aeon_article(url)
     else:
-        return fetch_general_article(url)
\ No newline at end of file
+        article = fetch_general_article(url)
+
+    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, 'w') as f:
+        json.dump(article, f)
+
+    return article
\ No newline at end of file
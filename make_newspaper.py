@@ -4,6 +4,7 @@ Newspaper Generator - Convert article URLs to a printable PDF newspaper
 """
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from article_fetcher import fetch_article
 from pdf_generator import generate_newspaper_pdf
@@ -43,17 +44,25 @@ def main():
     urls = load_urls(args.urls_file)
     print(f"Loaded {len(urls)} URLs")
     
-    # Fetch articles
-    articles = []
-    for i, url in enumerate(urls, 1):
-        print(f"[{i}/{len(urls)}] Fetching: {url}")
-        try:
-            article = fetch_article(url)
-            articles.append(article)
-            print(f"  → Got: {article['title']}")
-        except Exception as e:
-            print(f"  → Failed: {e}")
-            continue
+    # Fetch articles in parallel - this is pure network I/O, so threads
+    # give a near-linear speedup over fetching one URL at a time
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(urls)))) as executor:
+        futures = {
+            executor.submit(fetch_article, url): (i, url)
+            for i, url in enumerate(urls, 1)
+        }
+        for future in as_completed(futures):
+            i, url = futures[future]
+            try:
+                article = future.result()
+                results[i] = article
+                print(f"[{i}/{len(urls)}] Got: {article['title']}")
+            except Exception as e:
+                print(f"[{i}/{len(urls)}] Failed {url}: {e}")
+
+    # Preserve the order of the URL file in the newspaper
+    articles = [results[i] for i in sorted(results)]
     
     if not articles:
         print("Error: No articles were successfully fetched")
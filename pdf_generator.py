@@ -5,19 +5,43 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
-from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer, PageBreak, KeepTogether, FrameBreak
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer, PageBreak, KeepTogether, FrameBreak, ListFlowable, ListItem
 from reportlab.platypus.flowables import HRFlowable
 from reportlab.platypus import Image as RLImage
+from collections import deque
+from functools import lru_cache
 from io import BytesIO
+from itertools import chain
 from reportlab.lib import colors
-from bs4 import BeautifulSoup
-from datetime import datetime
+from lxml import etree
+import lxml.html
+from datetime import date
+from xml.sax.saxutils import escape
 import re
 import requests
 
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3'})
 
+# Headings that start a references section (compiled once; matching is
+# case-insensitive without allocating a lowercased copy per heading)
+_REFS_RE = re.compile(r'^(references|bibliography|works cited)$', re.I)
+
+# Tags and class names stripped from article HTML before layout
+_DROP_TAGS = frozenset({'script', 'style', 'button', 'form', 'nav', 'aside'})
+_DROP_CLASSES = frozenset({
+    'subscription-widget-wrap',   # Substack subscribe boxes
+    'button-wrapper',             # Substack buttons
+    'footnote',                   # footnotes
+    'fusion-post-cards',          # Squarespace related posts
+    'ct-ad-slot',                 # ads
+    'article-action-bar',         # action bars / menus
+    'article-content-footer',     # footer/share/tag sections
+})
+
+
+@lru_cache(maxsize=1)
 def create_styles():
-    """Create newspaper-specific paragraph styles"""
+    """Create newspaper-specific paragraph styles (built once per process)"""
     styles = getSampleStyleSheet()
     
     # Newspaper title
@@ -134,170 +158,287 @@ def add_page_number(canvas, doc):
     canvas.restoreState()
 
 
+# Immutable flowables reused across the story instead of re-allocated
+# per paragraph/article
+_SPACER_TINY = Spacer(1, 0.05*cm)
+_SPACER_SMALL = Spacer(1, 0.2*cm)
+_SPACER_MEDIUM = Spacer(1, 0.3*cm)
+_RULE_THIN = HRFlowable(width="100%", thickness=1, color=colors.black)
+_RULE_THICK = HRFlowable(width="100%", thickness=2, color=colors.black)
+
+
+def _element_text(el):
+    """Flattened text of an lxml element with whitespace collapsed,
+    like bs4's get_text(separator=' ', strip=True)."""
+    return ' '.join(el.text_content().split())
+
+
+def _classes(el):
+    return (el.get('class') or '').split()
+
+
+def _para(text, style):
+    """Paragraph from plain text.
+
+    get_text() output carries no markup, so escape it up front - the
+    paraparser then takes the fast path and stray '&'/'<' in article
+    text can't be misread (or rejected) as inline tags.
+    """
+    return Paragraph(escape(text), style)
+
+
+def _handle_p(elem, styles):
+    text = _element_text(elem)
+    if not text:
+        return []
+
+    classes = _classes(elem)
+
+    if 'pullquote' in classes:
+        return [_para(text, styles['Quote'])]
+
+    if 'is-style-article-bio' in classes:
+        return [_SPACER_MEDIUM, _para(text, styles['ArticleMeta'])]
+
+    return [_para(text, styles['ColumnBody'])]
+
+
+def _handle_heading(elem, styles):
+    text = _element_text(elem)
+    if not text:
+        return []
+    return [_para(text, styles['ArticleHeading'])]
+
+
+def _handle_subheading(elem, styles):
+    text = _element_text(elem)
+    if not text:
+        return []
+    return [_para(text, styles['ArticleSubheading'])]
+
+
+def _handle_blockquote(elem, styles):
+    text = _element_text(elem)
+    if not text:
+        return []
+    return [_para(text, styles['Quote'])]
+
+
+def _handle_list(elem, styles):
+    items = []
+    for li in elem.findall('li'):
+        text = _element_text(li)
+        if text:
+            items.append(ListItem(_para(text, styles['ColumnBody'])))
+    if not items:
+        return []
+    # One ListFlowable per list - ReportLab numbers the items itself and
+    # lays them out as a single flowable
+    bullet_type = 'bullet' if elem.tag == 'ul' else '1'
+    return [ListFlowable(items, bulletType=bullet_type, leftIndent=0.5*cm)]
+
+
+def _handle_image_div(elem, styles):
+    result = []
+    img = elem.find('.//img')
+    if img is not None:
+        src = img.get('src')
+        if src and not src.startswith('data:'):
+            try:
+                response = requests.get(src, timeout=10)
+                response.raise_for_status()
+                img_bytes = BytesIO(response.content)
+
+                # Create image
+                max_width = 5.5 * cm
+                img_obj = RLImage(img_bytes)
+
+                # Scale to fit column
+                aspect = img_obj.imageHeight / img_obj.imageWidth
+                img_obj.drawWidth = max_width
+                img_obj.drawHeight = max_width * aspect
+
+                # Max height constraint
+                max_height = 8 * cm
+                if img_obj.drawHeight > max_height:
+                    img_obj.drawHeight = max_height
+                    img_obj.drawWidth = max_height / aspect
+
+                result.append(img_obj)
+
+                # Look for caption (figcaption for Substack, p.wp-caption-text for WordPress)
+                figcaption = elem.find('.//figcaption')
+                if figcaption is None:
+                    for p in elem.iter('p'):
+                        if 'wp-caption-text' in _classes(p):
+                            figcaption = p
+                            break
+                if figcaption is not None:
+                    caption_text = _element_text(figcaption)
+                    if caption_text:
+                        result.append(_para(caption_text, styles['ImageCaption']))
+
+            except Exception as e:
+                print(f"  → Failed to embed image {src}: {e}")
+    return result
+
+
+# O(1) dispatch by tag name - built once instead of an if/elif cascade
+# re-evaluated per element
+_HANDLERS = {
+    'p': _handle_p,
+    'h1': _handle_heading,
+    'h2': _handle_heading,
+    'h3': _handle_subheading,
+    'h4': _handle_subheading,
+    'h5': _handle_subheading,
+    'h6': _handle_subheading,
+    'blockquote': _handle_blockquote,
+    'ul': _handle_list,
+    'ol': _handle_list,
+}
+
+# Container tags whose children are walked in place of the tag itself
+_CONTAINER_TAGS = frozenset({'div', 'article', 'section', 'main', 'body'})
+
+
+def _flowables_from_tree(root, styles):
+    """Walk the element tree depth-first with an explicit stack.
+
+    Substack posts nest divs heavily; an explicit stack flattens them
+    without a Python call frame (and intermediate result list) per level.
+    Works on raw lxml elements - no per-node wrapper objects.
+    """
+    out = []
+    stack = deque([root])
+    while stack:
+        elem = stack.popleft()
+        if not isinstance(elem.tag, str):
+            continue  # comments and processing instructions
+        name = elem.tag
+        if name in _CONTAINER_TAGS:
+            # Check if this is an image container (Substack or WordPress)
+            if name == 'div':
+                div_classes = _classes(elem)
+                if 'captioned-image-container' in div_classes or 'wp-caption' in div_classes:
+                    out.extend(_handle_image_div(elem, styles))
+                    continue
+            # Normal container - walk children in document order
+            stack.extendleft(reversed(list(elem)))
+            continue
+        handler = _HANDLERS.get(name)
+        if handler:
+            out.extend(handler(elem, styles))
+    return out
+
+
+def _drop_element(el):
+    """Remove an element but keep its tail text, like bs4's decompose()."""
+    parent = el.getparent()
+    if parent is None:
+        return
+    if el.tail:
+        prev = el.getprevious()
+        if prev is not None:
+            prev.tail = (prev.tail or '') + el.tail
+        else:
+            parent.text = (parent.text or '') + el.tail
+    parent.remove(el)
+
+
 def html_to_flowables(html_content, styles):
     """Convert HTML content to ReportLab flowables"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    flowables = []
-    
-    # Remove unwanted tags
-    for tag in soup.find_all(['script', 'style', 'button', 'form', 'nav']):
-        tag.decompose()
+    if not html_content or not html_content.strip():
+        return []
 
-    # Remove subscription widgets:
-    for tag in soup.find_all('div', class_='subscription-widget-wrap'):
-        tag.decompose()
+    # Parse straight into lxml - bs4 would wrap every node in a Python
+    # Tag object just for us to read a name, a class and some text
+    root = lxml.html.fromstring(html_content)
+    if root.tag == 'html':
+        # Full document rather than a content fragment - walk its body
+        body = root.find('body')
+        if body is not None:
+            root = body
 
-    # Remove buttons
-    for tag in soup.find_all('p', class_='button-wrapper'):
-        tag.decompose()
-    
-    # Remove footnotes
-    for tag in soup.find_all('div', class_='footnote'):
-        tag.decompose()
-    
-    # Remove Squarespace related posts section
-    for tag in soup.find_all('div', class_='fusion-post-cards'):
-        tag.decompose()
-
-    # Remove ads
-    for tag in soup.find_all('div', class_='ct-ad-slot'):
-        tag.decompose()
-
-    # Remove action bars / menus
-    for tag in soup.find_all('section', class_='article-action-bar'):
-        tag.decompose()
-
-    # Remove footer/share/tag sections
-    for tag in soup.find_all('div', class_='article-content-footer'):
-        tag.decompose()
-
-    # Remove sidebar
-    for tag in soup.find_all('aside'):
-        tag.decompose()
-
-    # Remove References sections:
-    for h_tag in soup.find_all(['h1', 'h2', 'h3']):
-        if h_tag.get_text(strip=True).lower() == 'references':
-            # Delete everything between this heading and the next heading (or end)
-            current = h_tag.next_sibling
-            while current:
-                next_sibling = current.next_sibling
-                if hasattr(current, 'name') and current.name in ['h1', 'h2', 'h3']:
+    # Remove unwanted tags in one C pass (tail text is preserved)
+    etree.strip_elements(root, *_DROP_TAGS, with_tail=False)
+
+    # Remove widgets, ads, footers etc. by class
+    for el in [el for el in root.iter() if not _DROP_CLASSES.isdisjoint(_classes(el))]:
+        _drop_element(el)
+
+    # Remove References sections: delete everything between the heading
+    # and the next heading (or end), then the heading itself
+    for h_el in root.iter(*_HEADING_TAGS):
+        if _REFS_RE.match(_element_text(h_el)):
+            sibling = h_el.getnext()
+            while sibling is not None:
+                if isinstance(sibling.tag, str) and sibling.tag in _HEADING_TAGS:
                     break
-                if hasattr(current, 'decompose'):
-                    current.decompose()
-                current = next_sibling
-            # Delete the References heading itself
-            h_tag.decompose()
+                following = sibling.getnext()
+                _drop_element(sibling)
+                sibling = following
+            _drop_element(h_el)
             break
-    
-    # Process top-level elements
-    def process_element(elem):
-        result = []
-        
-        if elem.name == 'p':
-            text = elem.get_text(separator=' ', strip=True)
-            if not text:
-                return result
-
-            classes = elem.get('class', [])
-
-            if 'pullquote' in classes:
-                result.append(Paragraph(text, styles['Quote']))
-
-            elif 'is-style-article-bio' in classes:
-                result.append(Spacer(1, 0.3*cm))
-                result.append(Paragraph(text, styles['ArticleMeta']))
-
-            else:
-                result.append(Paragraph(text, styles['ColumnBody']))
-        
-        elif elem.name in ['h1', 'h2']:
-            text = elem.get_text(separator=' ', strip=True)
-            if text:
-                result.append(Paragraph(text, styles['ArticleHeading']))
-        
-        elif elem.name in ['h3', 'h4', 'h5', 'h6']:
-            text = elem.get_text(separator=' ', strip=True)
-            if text:
-                result.append(Paragraph(text, styles['ArticleSubheading']))
-        
-        elif elem.name == 'blockquote':
-            text = elem.get_text(separator=' ', strip=True)
-            if text:
-                result.append(Paragraph(text, styles['Quote']))
-        
-        elif elem.name in ['ul', 'ol']:
-            for li in elem.find_all('li', recursive=False):
-                text = li.get_text(separator=' ', strip=True)
-                if text:
-                    # Simple bullet point
-                    bullet = '•' if elem.name == 'ul' else f"{len(result)+1}."
-                    result.append(Paragraph(f"{bullet} {text}", styles['ColumnBody']))
-        
-        elif elem.name == 'div':
-            # Check if this is an image container (Substack or WordPress)
-            div_classes = elem.get('class', [])
-            if 'captioned-image-container' in div_classes or 'wp-caption' in div_classes:
-                img = elem.find('img')
-                if img:
-                    src = img.get('src')
-                    if src and not src.startswith('data:'):
-                        try:
-                            response = requests.get(src, timeout=10)
-                            response.raise_for_status()
-                            img_bytes = BytesIO(response.content)
-                            
-                            # Create image
-                            max_width = 5.5 * cm
-                            img_obj = RLImage(img_bytes)
-                            
-                            # Scale to fit column
-                            aspect = img_obj.imageHeight / img_obj.imageWidth
-                            img_obj.drawWidth = max_width
-                            img_obj.drawHeight = max_width * aspect
-                            
-                            # Max height constraint
-                            max_height = 8 * cm
-                            if img_obj.drawHeight > max_height:
-                                img_obj.drawHeight = max_height
-                                img_obj.drawWidth = max_height / aspect
-                            
-                            result.append(img_obj)
-                            
-                            # Look for caption (figcaption for Substack, p.wp-caption-text for WordPress)
-                            figcaption = elem.find('figcaption')
-                            if not figcaption:
-                                figcaption = elem.find('p', class_='wp-caption-text')
-                            if figcaption:
-                                caption_text = figcaption.get_text(separator=' ', strip=True)
-                                if caption_text:
-                                    result.append(Paragraph(caption_text, styles['ImageCaption']))
-                            
-                        except Exception as e:
-                            print(f"  → Failed to embed image {src}: {e}")
-                # Don't process children - we handled this container
-            else:
-                # Normal div - process children
-                for child in elem.children:
-                    if hasattr(child, 'name'):
-                        result.extend(process_element(child))
-
-        elif elem.name in ['article', 'section', 'main']:
-            # Container tags - process children
-            for child in elem.children:
-                if hasattr(child, 'name'):
-                    result.extend(process_element(child))
-        
-        return result
-    
-    # Find main content
-    body = soup.find('body') or soup
-    for elem in body.children:
-        if hasattr(elem, 'name'):
-            flowables.extend(process_element(elem))
-    
-    return flowables
+
+    return _flowables_from_tree(root, styles)
+
+
+@lru_cache(maxsize=1)
+def _today_str(date_ordinal):
+    """Format the masthead date once per day, not once per PDF build."""
+    return date.fromordinal(date_ordinal).strftime('%A, %B %d, %Y')
+
+
+def _header_flowables(articles, styles):
+    """Masthead, date line and table of contents."""
+    today = _today_str(date.today().toordinal())
+    flows = [
+        Paragraph('THE WEEKLY', styles['NewspaperTitle']),
+        Paragraph(today, styles['NewspaperDate']),
+        _RULE_THICK,
+        _SPACER_MEDIUM,
+        Paragraph('TABLE OF CONTENTS', styles['ArticleHeading']),
+        _SPACER_MEDIUM,
+    ]
+
+    for i, article in enumerate(articles, 1):
+        # Article number and title
+        toc_entry = f"{i}. {article['title']}"
+        flows.append(_para(toc_entry, styles['ColumnBody']))
+
+        # Optional: add author under title
+        author_line = f"    {article['author']}"
+        flows.append(_para(author_line, styles['ArticleMeta']))
+
+        flows.append(_SPACER_SMALL)
+
+    return flows
+
+
+def _article_flowables(article, styles):
+    """One article: divider, title, metadata and content."""
+    meta_text = article['author']
+    if article.get('date'):
+        meta_text += f" • {article['date']}"
+
+    flows = [
+        # Force new column for each article
+        FrameBreak(),
+        # Article divider
+        _SPACER_TINY,
+        _RULE_THIN,
+        _SPACER_MEDIUM,
+        # Article title and metadata
+        _para(article['title'], styles['ArticleTitle']),
+        _para(meta_text, styles['ArticleMeta']),
+        # Add line under metadata
+        _SPACER_SMALL,
+        _RULE_THIN,
+        _SPACER_MEDIUM,
+    ]
+    flows.extend(html_to_flowables(article['content_html'], styles))
+    return flows
 
 
 def generate_newspaper_pdf(articles, output_path, debug=False):
@@ -370,58 +511,13 @@ def generate_newspaper_pdf(articles, output_path, debug=False):
     
     # Create styles
     styles = create_styles()
-    
-    # Build story
-    story = []
-    
-    # Newspaper header (first article will start in columns)
-    today = datetime.now().strftime('%A, %B %d, %Y')
-    story.append(Paragraph('THE WEEKLY', styles['NewspaperTitle']))
-    story.append(Paragraph(today, styles['NewspaperDate']))
-    story.append(HRFlowable(width="100%", thickness=2, color=colors.black))
-    story.append(Spacer(1, 0.3*cm))
 
-    # Table of Contents
-    story.append(Paragraph('TABLE OF CONTENTS', styles['ArticleHeading']))
-    story.append(Spacer(1, 0.3*cm))
+    # Build the story as one flat pass over per-section lists instead of
+    # growing a single list append by append
+    story = list(chain.from_iterable(
+        [_header_flowables(articles, styles)]
+        + [_article_flowables(article, styles) for article in articles]
+    ))
 
-    for i, article in enumerate(articles, 1):
-        # Article number and title
-        toc_entry = f"{i}. {article['title']}"
-        story.append(Paragraph(toc_entry, styles['ColumnBody']))
-        
-        # Optional: add author under title
-        author_line = f"    {article['author']}"
-        story.append(Paragraph(author_line, styles['ArticleMeta']))
-        
-        story.append(Spacer(1, 0.2*cm))
-    
-    # Add articles
-    for i, article in enumerate(articles):
-        # Force new column for each article
-        story.append(FrameBreak())
-        
-        # Article divider
-        story.append(Spacer(1, 0.05*cm))
-        story.append(HRFlowable(width="100%", thickness=1, color=colors.black))
-        story.append(Spacer(1, 0.3*cm))
-        
-        # Article title and metadata
-        story.append(Paragraph(article['title'], styles['ArticleTitle']))
-        
-        meta_text = article['author']
-        if article.get('date'):
-            meta_text += f" • {article['date']}"
-        story.append(Paragraph(meta_text, styles['ArticleMeta']))
-        
-        # Add line under metadata
-        story.append(Spacer(1, 0.2*cm))
-        story.append(HRFlowable(width="100%", thickness=1, color=colors.black))
-        story.append(Spacer(1, 0.3*cm))
-        
-        # Article content
-        content_flowables = html_to_flowables(article['content_html'], styles)
-        story.extend(content_flowables)
-    
     # Build PDF
     doc.build(story)
\ No newline at end of file